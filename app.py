@@ -6,7 +6,9 @@ os.environ['DISABLE_TELEMETRY'] = 'True'
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
+from markdown_cleaner import clean_markdown
 import logging
 
 # Configure logging
@@ -136,6 +138,45 @@ async def chat(request: Request):
         traceback.print_exc()
         return {"error": str(e), "response": "I encountered an error processing your request."}
 
+@app.post("/chat/stream")
+async def chat_stream(request: Request):
+    data = await request.json()
+    message = data.get("message", "")
+
+    if not message:
+        raise HTTPException(status_code=400, detail="Empty message")
+
+    if chatbot is None:
+        raise HTTPException(status_code=500, detail="Chatbot not initialized")
+
+    logger.info(f"📨 Received (stream): {message[:50]}...")
+
+    # Check if agent executor is ready
+    if hasattr(chatbot, 'agent_executor') and chatbot.agent_executor is None:
+        logger.error("❌ Agent executor is None!")
+        return PlainTextResponse("Agent executor is not initialized. Please check backend logs.")
+
+    def answer_chunks():
+        # Runs in a worker thread, so the blocking fallback ask() is fine here
+        if hasattr(chatbot, 'ask_stream'):
+            chunks = chatbot.ask_stream(message)
+        else:
+            # Fallback chatbots only answer in one piece
+            chunks = iter([clean_markdown(chatbot.ask(message))])
+
+        pieces = []
+        try:
+            for text in chunks:
+                pieces.append(text)
+                yield text
+        finally:
+            # On client disconnect this stops the agent at its next token
+            if hasattr(chunks, 'close'):
+                chunks.close()
+        logger.info(f"📤 Response (stream): {''.join(pieces)[:50]}...")
+
+    return StreamingResponse(answer_chunks(), media_type="text/plain; charset=utf-8")
+
 @app.get("/health")
 async def health_check():
     import datetime
@@ -156,6 +197,7 @@ async def root():
         "message": "LAMA Retail AI Backend API",
         "endpoints": {
             "chat": "POST /chat",
+            "chat_stream": "POST /chat/stream",
             "health": "GET /health"
         },
         "status": "running"
@@ -0,0 +1,55 @@
+"""Micro-benchmark for markdown cleanup on large responses.
+
+Run with: python bench_markdown_cleaner.py
+"""
+import timeit
+
+from markdown_cleaner import MarkdownStreamCleaner, clean_markdown
+from test_markdown_cleaner import regex_chain
+
+SECTION = (
+    "## Returns & Exchanges\n\n"
+    "Items can be **exchanged** within *7 days* of delivery. "
+    "See the [return policy](https://lama.example/policies/return_policy) "
+    "or run `track_order` for status.\n"
+    "- Keep the original tags\n"
+    "- Bring the receipt\n"
+    "```text\nOrder ID: 12345\nStatus: delivered\n```\n\n"
+)
+RESPONSE = SECTION * (200_000 // len(SECTION))
+OPEN_FENCE = "Intro\n```\n" + "x = 1\n" * 30_000 + "```\nDone\n"
+LONG_LINE = "word " * 40_000
+CHUNK_SIZE = 4
+REPEAT = 5
+
+
+def stream(text):
+    cleaner = MarkdownStreamCleaner()
+    pieces = [cleaner.feed(text[i:i + CHUNK_SIZE])
+              for i in range(0, len(text), CHUNK_SIZE)]
+    pieces.append(cleaner.flush())
+    return "".join(pieces)
+
+
+def best(func, text):
+    return min(timeit.repeat(lambda: func(text), number=1, repeat=REPEAT))
+
+
+def main():
+    assert clean_markdown(RESPONSE) == regex_chain(RESPONSE) == stream(RESPONSE)
+    assert stream(OPEN_FENCE) == clean_markdown(OPEN_FENCE)
+    assert stream(LONG_LINE) == clean_markdown(LONG_LINE)
+
+    print(f"response: {len(RESPONSE) / 1000:.0f} KB, "
+          f"stream chunks of {CHUNK_SIZE} chars, best of {REPEAT}")
+    print(f"regex chain (reference){best(regex_chain, RESPONSE) * 1000:8.2f} ms")
+    print(f"clean_markdown         {best(clean_markdown, RESPONSE) * 1000:8.2f} ms")
+    print(f"MarkdownStreamCleaner  {best(stream, RESPONSE) * 1000:8.2f} ms")
+    print(f"stream, {len(OPEN_FENCE) / 1000:.0f} KB code fence "
+          f"{best(stream, OPEN_FENCE) * 1000:8.2f} ms")
+    print(f"stream, {len(LONG_LINE) / 1000:.0f} KB single line "
+          f"{best(stream, LONG_LINE) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
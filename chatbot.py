@@ -1,9 +1,50 @@
 import os
+from queue import Queue
+from threading import Thread
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.tools.retriever import create_retriever_tool
 from langchain.schema import SystemMessage
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain.callbacks.base import BaseCallbackHandler
+from markdown_cleaner import MarkdownStreamCleaner, clean_markdown
+
+
+def has_tool_call(response):
+    """Check whether an LLM result asks the agent to call a tool"""
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is None:
+                continue
+            if (message.additional_kwargs.get("function_call")
+                    or message.additional_kwargs.get("tool_calls")
+                    or getattr(message, "tool_calls", None)):
+                return True
+    return False
+
+
+class TokenQueueHandler(BaseCallbackHandler):
+    """Forward LLM tokens and the end of each LLM run to a queue"""
+    # Let close() abort the agent run instead of the error being logged
+    raise_error = True
+
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def close(self):
+        """Stop the agent run at its next token"""
+        self.closed = True
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if self.closed:
+            raise RuntimeError("Answer stream was closed")
+        self.events.put(("token", run_id, token))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self.events.put(("end", run_id, has_tool_call(response)))
+
 
 class LAMAChatbot:
     def __init__(self, vector_store, memory_manager):
@@ -69,4 +110,86 @@ Crucial Policy Note: If you find conflicting exchange periods (7 days in FAQ vs.
             return answer
 
         except Exception as e:
-            return f"I apologize, but I encountered an error: {str(e)}"
\ No newline at end of file
+            return f"I apologize, but I encountered an error: {str(e)}"
+
+    def ask_stream(self, question):
+        """Yield the answer as plain text while the agent generates it.
+
+        Each LLM run is cleaned separately and dropped if it ends in a tool
+        call. Whatever the final answer adds to the text already shown is
+        sent at the end; if the shown text was not the start of the answer,
+        the full answer follows on a new line. Closing the generator stops
+        the agent at its next token; a running tool call still finishes.
+        """
+        if self.agent_executor is None:
+            yield "Agent executor not initialized."
+            return
+
+        events = Queue()
+        done = object()
+        result = {}
+        handler = TokenQueueHandler(events)
+
+        def run():
+            try:
+                result["response"] = self.agent_executor.invoke(
+                    {"input": question},
+                    config={"callbacks": [handler]}
+                )
+            except Exception as e:
+                result["error"] = e
+            finally:
+                events.put(done)
+
+        Thread(target=run, daemon=True).start()
+
+        cleaners = {}
+        shown = []
+        try:
+            while True:
+                event = events.get()
+                if event is done:
+                    break
+                kind, run_id, value = event
+                if kind == "token":
+                    cleaner = cleaners.setdefault(run_id, MarkdownStreamCleaner())
+                    text = cleaner.feed(value)
+                    if text:
+                        if shown and not text.startswith(" "):
+                            text = " " + text
+                        shown.append(text)
+                        yield text
+                elif value:
+                    # Text next to a tool call is not part of the answer
+                    cleaners.pop(run_id, None)
+        finally:
+            handler.close()
+
+        if "error" in result:
+            for cleaner in cleaners.values():
+                text = cleaner.flush()
+                if text:
+                    if shown and not text.startswith(" "):
+                        text = " " + text
+                    shown.append(text)
+                    yield text
+            separator = "\n" if shown else ""
+            yield f"{separator}I apologize, but I encountered an error: {str(result['error'])}"
+            return
+
+        response = result["response"]
+        if isinstance(response, dict) and "output" in response:
+            answer = response["output"]
+        else:
+            answer = str(response)
+
+        shown_text = "".join(shown)
+        expected = clean_markdown(answer)
+        if expected.startswith(shown_text):
+            text = expected[len(shown_text):]
+        else:
+            text = "\n" + expected
+        if text:
+            yield text
+
+        self.memory_manager.add_interaction(question, answer)
@@ -1,6 +1,5 @@
 # File: main.py
 import os
-import re
 from dotenv import load_dotenv
 from pdf_processor import PDFProcessor
 from vector_store_manager import VectorStoreManager
@@ -25,19 +24,6 @@ def setup_knowledge_base(pdf_path="Lama1.pdf"):
     return vector_manager.create_vector_store(chunks)
 
 
-def clean_markdown(text):
-    if not text:
-        return ""
-    text = re.sub(r'\*\*|\*|__|_', '', text)
-    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-    text = re.sub(r'`[^`]*`', '', text)
-    text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^[*-]\s+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
-
-
 # ----------------- Main -----------------
 def main():
     load_dotenv()
@@ -69,7 +55,8 @@ def main():
         agent=agent,
         tools=[chatbot.retriever_tool],
         memory=memory_manager.get_memory(),
-        verbose=True
+        # Chain logs from the worker thread would mix with the streamed answer
+        verbose=False
     )
     chatbot.set_agent_executor(executor)
 
@@ -92,10 +79,10 @@ def main():
                 break
 
             print("🔍 Searching knowledge base...")
-            response = chatbot.ask(question)
-
-            cleaned_response = clean_markdown(response)
-            print(f"\n🤖 LAMA Support:\n{cleaned_response}")
+            print("\n🤖 LAMA Support:")
+            for text in chatbot.ask_stream(question):
+                print(text, end="", flush=True)
+            print()
 
         except KeyboardInterrupt:
             print("\n👋 Interrupted. Exiting.")
@@ -0,0 +1,142 @@
+import re
+
+# Patterns are compiled once and applied in the original order; later rules
+# depend on what earlier ones removed, so they cannot be merged into one regex.
+_EMPHASIS_CHARS = str.maketrans("", "", "*_")
+_CODE_BLOCK_RE = re.compile(r'```.*?```', re.DOTALL)
+_INLINE_CODE_RE = re.compile(r'`[^`]*`')
+_HEADER_RE = re.compile(r'^#+\s+', re.MULTILINE)
+# '*' bullets are already gone together with the emphasis markers
+_LIST_RE = re.compile(r'^-\s+', re.MULTILINE)
+# Links stay on one line, so a stray '[' never holds back a stream
+_LINK_RE = re.compile(r'\[([^\]\n]+)\]\([^)\n]+\)')
+
+
+def _strip_markdown(text):
+    """Clean text whose emphasis markers have already been removed"""
+    if "`" in text:
+        text = _CODE_BLOCK_RE.sub('', text)
+        text = _INLINE_CODE_RE.sub('', text)
+    if "#" in text:
+        text = _HEADER_RE.sub('', text)
+    if "-" in text:
+        text = _LIST_RE.sub('', text)
+    if "[" in text:
+        text = _LINK_RE.sub(r'\1', text)
+    return " ".join(text.split())
+
+
+def clean_markdown(text):
+    """Remove markdown formatting and collapse whitespace"""
+    if not text:
+        return ""
+    return _strip_markdown(text.translate(_EMPHASIS_CHARS))
+
+
+class MarkdownStreamCleaner:
+    """Incremental clean_markdown for responses that arrive in chunks.
+
+    Text is held back until a line break outside any code fence or inline
+    code span, so joining everything returned by feed() and flush() gives
+    the same result as clean_markdown() on the full response.
+    """
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        # Pending text is kept as chunks and only joined when it is cut or
+        # flushed, so a long stretch without a cut stays linear.
+        self._chunks = []
+        self._emitted = False
+        # Backtick state of the text scanned so far; the few characters
+        # that could not be classified yet are rescanned with the next chunk
+        self._unscanned = ""
+        self._scanned = 0
+        self._in_fence = False
+        self._in_inline_code = False
+        self._cut = 0
+
+    def feed(self, chunk):
+        """Add a chunk and return the cleaned text that is ready to show"""
+        if not chunk:
+            return ""
+        chunk = chunk.translate(_EMPHASIS_CHARS)
+        self._chunks.append(chunk)
+        self._scan(self._unscanned + chunk)
+        if not self._cut:
+            return ""
+
+        pending = "".join(self._chunks)
+        ready, rest = pending[:self._cut], pending[self._cut:]
+        self._chunks = [rest] if rest else []
+        self._scanned -= self._cut
+        self._cut = 0
+        return self._emit(_strip_markdown(ready))
+
+    def flush(self):
+        """Return the cleaned remainder once the response has ended"""
+        text = self._emit(_strip_markdown("".join(self._chunks)))
+        self._reset()
+        return text
+
+    def _scan(self, window):
+        # Follow code fences and inline code spans through the new text the
+        # same way the code patterns pair backticks, remembering the last
+        # line break that lies outside both.
+        base = self._scanned
+        end = len(window)
+        pos = 0
+        while pos < end:
+            if self._in_fence:
+                close = window.find("```", pos)
+                if close == -1:
+                    pos = max(pos, end - 2)
+                    break
+                self._in_fence = False
+                pos = close + 3
+                continue
+
+            tick = window.find("`", pos)
+            if tick == -1:
+                if not self._in_inline_code:
+                    self._mark_cut(window, base, pos, end)
+                # The last character decides whether a trailing newline
+                # is a valid cut, so look at it again next time
+                pos = max(pos, end - 1)
+                break
+            if not self._in_inline_code:
+                self._mark_cut(window, base, pos, tick)
+
+            head = window[tick:tick + 3]
+            if head == "```":
+                self._in_fence = True
+                pos = tick + 3
+            elif len(head) < 3 and head == "`" * len(head):
+                # Not enough text yet to tell a fence from inline code
+                pos = tick
+                break
+            else:
+                self._in_inline_code = not self._in_inline_code
+                pos = tick + 1
+        self._unscanned = window[pos:]
+        self._scanned = base + pos
+
+    def _mark_cut(self, window, base, start, stop):
+        # Split right after a newline whose next character cannot be
+        # whitespace or code, so header, list and code rules see the same
+        # line starts on both sides of the split.
+        newline = window.rfind("\n", start, min(stop, len(window) - 1))
+        while newline != -1:
+            following = window[newline + 1]
+            if following != "`" and not following.isspace():
+                self._cut = max(self._cut, base + newline + 1)
+                return
+            newline = window.rfind("\n", start, newline)
+
+    def _emit(self, text):
+        if not text:
+            return ""
+        if self._emitted:
+            text = " " + text
+        self._emitted = True
+        return text
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+import app as backend
+from markdown_cleaner import clean_markdown
+
+
+class OneShotChatbot:
+    def ask(self, message):
+        return "**Hello** from `fallback`"
+
+
+class StreamingChatbot:
+    agent_executor = object()
+
+    def __init__(self):
+        self.closed = False
+
+    def ask_stream(self, message):
+        try:
+            yield "First"
+            yield " second"
+        finally:
+            self.closed = True
+
+
+class NoExecutorChatbot:
+    agent_executor = None
+
+    def ask_stream(self, message):
+        raise AssertionError("should not be called")
+
+
+@pytest.fixture
+def client():
+    return TestClient(backend.app)
+
+
+def test_chat_stream_uses_ask_stream(client, monkeypatch):
+    chatbot = StreamingChatbot()
+    monkeypatch.setattr(backend, "chatbot", chatbot)
+    response = client.post("/chat/stream", json={"message": "hi"})
+    assert response.status_code == 200
+    assert response.text == "First second"
+    assert response.headers["content-type"].startswith("text/plain")
+    assert chatbot.closed
+
+
+def test_chat_stream_falls_back_to_ask(client, monkeypatch):
+    monkeypatch.setattr(backend, "chatbot", OneShotChatbot())
+    response = client.post("/chat/stream", json={"message": "hi"})
+    assert response.status_code == 200
+    assert response.text == clean_markdown(OneShotChatbot().ask("hi"))
+
+
+def test_chat_stream_without_executor(client, monkeypatch):
+    monkeypatch.setattr(backend, "chatbot", NoExecutorChatbot())
+    response = client.post("/chat/stream", json={"message": "hi"})
+    assert response.status_code == 200
+    assert response.text == "Agent executor is not initialized. Please check backend logs."
+
+
+def test_chat_stream_rejects_empty_message(client, monkeypatch):
+    monkeypatch.setattr(backend, "chatbot", StreamingChatbot())
+    response = client.post("/chat/stream", json={"message": ""})
+    assert response.status_code == 400
+
+
+def test_chat_stream_without_chatbot(client, monkeypatch):
+    monkeypatch.setattr(backend, "chatbot", None)
+    response = client.post("/chat/stream", json={"message": "hi"})
+    assert response.status_code == 500
@@ -0,0 +1,148 @@
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("langchain_google_genai")
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from chatbot import LAMAChatbot
+from markdown_cleaner import clean_markdown
+
+
+class FakeMemoryManager:
+    def __init__(self):
+        self.interactions = []
+
+    def add_interaction(self, question, answer):
+        self.interactions.append((question, answer))
+
+
+class FakeExecutor:
+    """Replays LLM runs through the callbacks passed in config"""
+    def __init__(self, runs, output=None, error=None):
+        # runs: list of (tokens, ends_with_tool_call)
+        self.runs = runs
+        self.output = output
+        self.error = error
+
+    def invoke(self, inputs, config):
+        callbacks = config["callbacks"]
+        text = ""
+        for tokens, tool_call in self.runs:
+            run_id = uuid4()
+            for token in tokens:
+                for handler in callbacks:
+                    handler.on_llm_new_token(token, run_id=run_id)
+            text = "".join(tokens)
+            kwargs = {"function_call": {"name": "lama_knowledge_search"}} if tool_call else {}
+            message = AIMessage(content=text, additional_kwargs=kwargs)
+            result = LLMResult(generations=[[ChatGeneration(message=message)]])
+            for handler in callbacks:
+                handler.on_llm_end(result, run_id=run_id)
+        if self.error is not None:
+            raise self.error
+        return {"input": inputs["input"], "output": self.output if self.output is not None else text}
+
+
+def make_chatbot(executor):
+    # Skip __init__, which needs a Gemini key and a vector store
+    chatbot = LAMAChatbot.__new__(LAMAChatbot)
+    chatbot.memory_manager = FakeMemoryManager()
+    chatbot.agent_executor = executor
+    return chatbot
+
+
+def chunked(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+ANSWER = "# Returns\n\nItems can be **exchanged** within 7 days.\n- Keep the tags\nThanks!"
+
+
+def test_ask_stream_yields_cleaned_answer_in_pieces():
+    chatbot = make_chatbot(FakeExecutor([(chunked(ANSWER), False)]))
+    pieces = list(chatbot.ask_stream("returns?"))
+    assert len(pieces) > 1
+    assert "".join(pieces) == clean_markdown(ANSWER)
+    assert chatbot.memory_manager.interactions == [("returns?", ANSWER)]
+
+
+def test_ask_stream_falls_back_to_output_without_tokens():
+    chatbot = make_chatbot(FakeExecutor([], output="**Done**"))
+    assert list(chatbot.ask_stream("q")) == ["Done"]
+    assert chatbot.memory_manager.interactions == [("q", "**Done**")]
+
+
+def test_ask_stream_drops_text_next_to_tool_call():
+    runs = [(chunked("Let me check that for you."), True), (chunked(ANSWER), False)]
+    chatbot = make_chatbot(FakeExecutor(runs))
+    assert "".join(chatbot.ask_stream("q")) == clean_markdown(ANSWER)
+
+
+def test_ask_stream_shows_output_not_written_by_model():
+    output = "Agent stopped due to iteration limit or time limit."
+    chatbot = make_chatbot(FakeExecutor([(["searching"], True)], output=output))
+    assert "".join(chatbot.ask_stream("q")) == output
+    assert chatbot.memory_manager.interactions == [("q", output)]
+
+
+def test_ask_stream_sends_full_answer_when_streamed_text_differs():
+    runs = [(chunked("Wrong start\nmore\n"), False)]
+    chatbot = make_chatbot(FakeExecutor(runs, output="Right answer"))
+    text = "".join(chatbot.ask_stream("q"))
+    assert text.endswith("\nRight answer")
+
+
+def test_ask_stream_flushes_before_error():
+    runs = [(chunked("First line\nheld back"), False)]
+    chatbot = make_chatbot(FakeExecutor(runs, error=RuntimeError("boom")))
+    pieces = list(chatbot.ask_stream("q"))
+    assert pieces == [
+        "First line",
+        " held back",
+        "\nI apologize, but I encountered an error: boom",
+    ]
+    assert chatbot.memory_manager.interactions == []
+
+
+def test_ask_stream_error_without_output():
+    chatbot = make_chatbot(FakeExecutor([], error=RuntimeError("boom")))
+    assert list(chatbot.ask_stream("q")) == ["I apologize, but I encountered an error: boom"]
+
+
+def test_ask_stream_without_executor():
+    chatbot = make_chatbot(None)
+    assert list(chatbot.ask_stream("q")) == ["Agent executor not initialized."]
+
+
+def test_closing_stream_stops_agent():
+    class EndlessExecutor:
+        def __init__(self):
+            self.stopped = threading.Event()
+            self.error = None
+
+        def invoke(self, inputs, config):
+            run_id = uuid4()
+            try:
+                while True:
+                    for handler in config["callbacks"]:
+                        handler.on_llm_new_token("line\n", run_id=run_id)
+                    time.sleep(0.001)
+            except Exception as e:
+                self.error = e
+                raise
+            finally:
+                self.stopped.set()
+
+    executor = EndlessExecutor()
+    chatbot = make_chatbot(executor)
+    stream = chatbot.ask_stream("q")
+    assert next(stream) == "line"
+    stream.close()
+    assert executor.stopped.wait(timeout=5)
+    assert isinstance(executor.error, RuntimeError)
+    assert chatbot.memory_manager.interactions == []
@@ -0,0 +1,139 @@
+import random
+import re
+
+import pytest
+
+from markdown_cleaner import MarkdownStreamCleaner, clean_markdown
+
+
+def regex_chain(text, link=r'\[([^\]\n]+)\]\([^)\n]+\)'):
+    """The original eight re.sub passes, with links kept on one line"""
+    if not text:
+        return ""
+    text = re.sub(r'\*\*|\*|__|_', '', text)
+    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
+    text = re.sub(r'`[^`]*`', '', text)
+    text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'^[*-]\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(link, r'\1', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def stream(text, rng, max_chunk=6):
+    cleaner = MarkdownStreamCleaner()
+    pieces = []
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, max_chunk)
+        pieces.append(cleaner.feed(text[pos:pos + size]))
+        pos += size
+    pieces.append(cleaner.flush())
+    return "".join(pieces)
+
+
+CASES = [
+    # Empty input
+    ("", ""),
+    (None, ""),
+    # Emphasis markers
+    ("**bold** and *italic*", "bold and italic"),
+    ("__bold__ and _italic_ snake_case", "bold and italic snakecase"),
+    # Fenced and inline code
+    ("before\n```python\nprint(1)\n```\nafter", "before after"),
+    ("use `pip install` now", "use now"),
+    ("```a\n``` mid ```b```", "mid"),
+    ("````x", "x"),
+    ("unclosed `tick", "unclosed `tick"),
+    # Headers
+    ("# Title\n## Sub\ntext", "Title Sub text"),
+    ("#no space", "#no space"),
+    ("a # not a header", "a # not a header"),
+    # Bullets
+    ("- one\n- two", "one two"),
+    ("* one\n* two", "one two"),
+    ("-not a bullet", "-not a bullet"),
+    # Links
+    ("see [the docs](http://x.y/a_b)", "see the docs"),
+    ("[](empty) [a]()", "[](empty) [a]()"),
+    ("[a][b](c)", "[a]b"),
+    # Whitespace collapse
+    ("  a \t b\n\n c  ", "a b c"),
+    ("a  b", "a b"),
+]
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_clean_markdown(text, expected):
+    assert clean_markdown(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Inline code is removed before headers, so a header can appear later
+    ("`x`# h", "h"),
+    # Emphasis markers are removed first and can reveal a header or bullet
+    ("**# h", "h"),
+    ("_- item", "item"),
+    # Code removal can join the parts of a link
+    ("[a`c`](b)", "a"),
+    ("[a]`x`(b)", "a"),
+    # Headers run before bullets, but not the other way round
+    ("# - x", "x"),
+    ("- # x", "# x"),
+])
+def test_rule_order(text, expected):
+    assert clean_markdown(text) == expected
+    assert regex_chain(text) == expected
+
+
+def test_links_do_not_span_lines():
+    # The only deliberate change from the original regex chain
+    text = "[multi\nline](url)"
+    assert clean_markdown(text) == "[multi line](url)"
+    assert regex_chain(text, link=r'\[([^\]]+)\]\([^)]+\)') == "multi line"
+
+
+def test_matches_regex_chain_on_random_input():
+    rng = random.Random(0)
+    alphabet = ["a", "b", " ", "\n", "\t", "*", "_", "`", "```", "#", "-",
+                "[", "]", "(", ")"]
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert clean_markdown(text) == regex_chain(text), text
+
+
+def test_stream_matches_batch_on_random_chunks():
+    rng = random.Random(1)
+    alphabet = ["a", "b", " ", "\n", "\n", "\t", "*", "_", "`", "```", "#",
+                "-", "[", "]", "(", ")"]
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert stream(text, rng) == clean_markdown(text), text
+
+
+def test_stream_emits_before_flush():
+    cleaner = MarkdownStreamCleaner()
+    assert cleaner.feed("# Title\n\nFirst **line**\nSec") == "Title First line"
+    assert cleaner.feed("ond line\n") == ""
+    assert cleaner.flush() == " Second line"
+
+
+def test_stream_holds_back_open_code():
+    cleaner = MarkdownStreamCleaner()
+    assert cleaner.feed("intro\nnext\n```\ncode\nmore code\n") == "intro"
+    assert cleaner.feed("```\nafter\nend") == " next after"
+    assert cleaner.flush() == " end"
+
+
+def test_stream_not_blocked_by_stray_bracket():
+    cleaner = MarkdownStreamCleaner()
+    assert cleaner.feed("see [note\nmore arr[i\nand") == "see [note more arr[i"
+    assert cleaner.flush() == " and"
+
+
+def test_stream_can_be_reused_after_flush():
+    cleaner = MarkdownStreamCleaner()
+    assert cleaner.feed("**a**\n`open") == ""
+    assert cleaner.flush() == "a `open"
+    assert cleaner.feed("b\nc") == "b"
+    assert cleaner.flush() == " c"